@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from numba import njit, float64, int64
+from config import MAX_CHART_POINTS
+
+def _lttb_indices(x, y, n_out):
+    """Select n_out points with Largest-Triangle-Three-Buckets
+
+    Returns the indices of the selected points. The first and last
+    points are always kept. If the series already has n_out points
+    or fewer, every index is returned.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    out = np.empty(n_out, dtype=np.int64)
+    n_buckets = n_out - 2
+    a = 0
+    out[0] = 0
+
+    # Integer bucket bounds, so the last bucket always ends at n - 1
+    for i in range(n_buckets):
+        start = 1 + (i * (n - 2)) // n_buckets
+        end = 1 + ((i + 1) * (n - 2)) // n_buckets
+
+        # Average of the next bucket, or the last point for the final bucket
+        if i == n_out - 3:
+            avg_x = x[n - 1]
+            avg_y = y[n - 1]
+        else:
+            next_end = 1 + ((i + 2) * (n - 2)) // n_buckets
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous pick
+        max_area = -1.0
+        chosen = start
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                chosen = j
+
+        out[i + 1] = chosen
+        a = chosen
+
+    out[n_out - 1] = n - 1
+    return out
+
+# Prefer the ahead-of-time build from _kernels_aot, otherwise compile on import
+try:
+    from crypto_kernels import lttb_indices
+except ImportError:
+    lttb_indices = njit(int64[:](float64[:], float64[:], int64), cache=True)(_lttb_indices)
+
+def downsample(df: pd.DataFrame, y_col: str, n_out: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    """Downsample a date-ordered frame for plotting, based on the shape of y_col"""
+    if len(df) <= n_out:
+        return df
+    x = df['date'].to_numpy().view(np.int64).astype(np.float64)
+    y = df[y_col].to_numpy(dtype=np.float64)
+    return df.iloc[lttb_indices(x, y, n_out)]
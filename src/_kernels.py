@@ -0,0 +1,19 @@
+import numpy as np
+
+def _rolling_mean(values, window):
+    """Trailing moving average using a running sum
+
+    Positions before the first full window are NaN, matching
+    pandas' rolling(window).mean().
+    """
+    out = np.empty_like(values)
+    total = 0.0
+    for i in range(len(values)):
+        total += values[i]
+        if i >= window:
+            total -= values[i - window]
+        if i >= window - 1:
+            out[i] = total / window
+        else:
+            out[i] = np.nan
+    return out
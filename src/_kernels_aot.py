@@ -0,0 +1,19 @@
+# Ahead-of-time build of the numba kernels. Run once after installing:
+#
+#     python src/_kernels_aot.py
+#
+# This writes the crypto_kernels extension module next to this file, which
+# data_processor and _downsample import in place of JIT compiling on first use.
+import os
+from numba.pycc import CC
+from _kernels import _rolling_mean
+from _downsample import _lttb_indices
+
+cc = CC('crypto_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('rolling_mean', 'f8[:](f8[:], i8)')(_rolling_mean)
+cc.export('lttb_indices', 'i8[:](f8[:], f8[:], i8)')(_lttb_indices)
+
+if __name__ == "__main__":
+    cc.compile()
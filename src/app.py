@@ -1,26 +1,36 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import plotly.graph_objects as go
-from data_processor import DataProcessor
+from data_processor import DataProcessor, compile_numba_kernels
+from _downsample import downsample
+from config import CHART_WORKERS
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict
 
 def create_price_chart(df: pd.DataFrame, coin_name: str):
     """Create an interactive price chart with moving average"""
     fig = go.Figure()
     
+    # Both traces share the points picked from the price series
+    df = downsample(df, 'price')
+    
     # Add price line
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=df['date'],
         y=df['price'],
         name=f'{coin_name} Price',
+        mode='lines',
         line=dict(color='blue')
     ))
     
     # Add moving average line
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=df['date'],
         y=df['moving_average'],
         name='5-Day Moving Average',
+        mode='lines',
         line=dict(color='red', dash='dash')
     ))
     
@@ -39,8 +49,8 @@ def create_comparison_chart(all_data: pd.DataFrame, selected_coins: List[str]):
     
     # Add a line for each selected coin
     for coin_id in selected_coins:
-        coin_data = all_data[all_data['coin_id'] == coin_id]
-        fig.add_trace(go.Scatter(
+        coin_data = downsample(all_data[all_data['coin_id'] == coin_id], 'price')
+        fig.add_trace(go.Scattergl(
             x=coin_data['date'],
             y=coin_data['price'],
             name=coin_id.capitalize(),
@@ -56,26 +66,32 @@ def create_comparison_chart(all_data: pd.DataFrame, selected_coins: List[str]):
     
     return fig
 
-def display_coin_metrics(stats: Dict[str, Any], coin_name: str):
+def display_coin_metrics(strings: Dict[str, str]):
     """Display metrics for a single coin"""
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
-        st.metric("Mean Price", f"${stats['mean_price']:,.2f}")
+        st.metric("Mean Price", strings['mean_price'])
     with col2:
-        st.metric("Standard Deviation", f"${stats['std_price']:,.2f}")
+        st.metric("Standard Deviation", strings['std_price'])
     with col3:
-        st.metric("Min Price", f"${stats['min_price']:,.2f}")
+        st.metric("Min Price", strings['min_price'])
     with col4:
-        st.metric("Max Price", f"${stats['max_price']:,.2f}")
+        st.metric("Max Price", strings['max_price'])
     with col5:
-        st.metric("Price Change", f"{stats['price_change_pct']:.2f}%")
+        st.metric("Price Change", strings['price_change_pct'])
 
-def display_comparison_metrics(comparison: Dict[str, Any]):
+def display_comparison_metrics(summary: pd.DataFrame):
     """Display comparison metrics for multiple coins"""
     st.subheader("Price Performance Comparison")
     
-    # Create a DataFrame for the comparison data
-    comparison_df = pd.DataFrame.from_dict(comparison, orient='index')
+    # Present the precomputed summary under the comparison metric names
+    comparison_df = summary.rename(columns={
+        'change_pct': 'price_change_pct',
+        'mean': 'mean_price',
+        'std': 'volatility',
+        'max': 'max_price',
+        'min': 'min_price'
+    })[['price_change_pct', 'mean_price', 'volatility', 'max_price', 'min_price']]
     comparison_df.index = comparison_df.index.str.capitalize()
     
     # Display the comparison table
@@ -87,17 +103,71 @@ def display_comparison_metrics(comparison: Dict[str, Any]):
     st.info(f"Best performing coin: {best_performer} ({comparison_df.loc[best_performer, 'price_change_pct']:.2f}%)")
     st.warning(f"Worst performing coin: {worst_performer} ({comparison_df.loc[worst_performer, 'price_change_pct']:.2f}%)")
 
+@st.cache_resource
+def get_processor() -> DataProcessor:
+    """Get the data processor shared by all sessions"""
+    compile_numba_kernels()
+    return DataProcessor()
+
+# The database mtime is passed to every cached loader so that entries are
+# invalidated as soon as new data is stored
+
+@st.cache_resource(show_spinner=False)
+def load_all_data(mtime: float) -> pd.DataFrame:
+    """Load price data for all coins
+    
+    Returns the processor's cached table itself rather than a copy, so
+    callers must not modify it.
+    """
+    return get_processor().get_all_coins_data()
+
+@st.cache_data(show_spinner=False)
+def load_price_data(coin_id: str, mtime: float) -> pd.DataFrame:
+    """Load price data with moving average for a single coin"""
+    return get_processor().get_price_data(coin_id)
+
+@st.cache_data(show_spinner=False)
+def load_summary(coin_ids: tuple, mtime: float) -> pd.DataFrame:
+    """Load precomputed summary statistics for multiple coins"""
+    return get_processor().get_summary(list(coin_ids))
+
+@st.cache_data(show_spinner=False)
+def load_display_strings(coin_ids: tuple, mtime: float) -> Dict[str, Dict[str, str]]:
+    """Load the formatted metrics and insights for multiple coins"""
+    return get_processor().format_display_strings(load_summary(coin_ids, mtime))
+
+@st.cache_data(show_spinner=False)
+def load_price_chart(coin_id: str, mtime: float):
+    """Build the price chart for a single coin"""
+    return create_price_chart(load_price_data(coin_id, mtime), coin_id.capitalize())
+
+def build_price_charts(coin_ids: List[str], mtime: float) -> Dict[str, go.Figure]:
+    """Build the price charts for multiple coins in parallel"""
+    # Worker threads need the script context to use the Streamlit cache
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=CHART_WORKERS,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        charts = executor.map(lambda coin_id: load_price_chart(coin_id, mtime), coin_ids)
+        return dict(zip(coin_ids, charts))
+
+@st.cache_data(show_spinner=False)
+def load_comparison_chart(coin_ids: tuple, mtime: float):
+    """Build the comparison chart for multiple coins"""
+    return create_comparison_chart(load_all_data(mtime), list(coin_ids))
+
 def main():
     st.set_page_config(page_title="Cryptocurrency Price Analysis", layout="wide")
     st.title("Cryptocurrency Price Analysis - Q1 2025")
     
     try:
-        # Initialize data processor
-        processor = DataProcessor()
+        # Cached results are keyed on the database modification time
+        mtime = get_processor().get_db_mtime()
         
         # Get all available coins
-        all_data = processor.get_all_coins_data()
-        available_coins = sorted(all_data['coin_id'].unique())
+        all_data = load_all_data(mtime)
+        available_coins = all_data['coin_id'].cat.categories.tolist()
         
         # Sidebar for coin selection
         st.sidebar.header("Select Coins")
@@ -115,38 +185,40 @@ def main():
         if len(selected_coins) > 1:
             # Display comparison chart
             st.subheader("Price Comparison")
-            st.plotly_chart(create_comparison_chart(all_data, selected_coins), use_container_width=True)
+            st.plotly_chart(load_comparison_chart(tuple(selected_coins), mtime), use_container_width=True)
             
             # Get and display comparison metrics
-            comparison = processor.get_coin_comparison(selected_coins)
-            display_comparison_metrics(comparison)
+            summary = load_summary(tuple(selected_coins), mtime)
+            display_comparison_metrics(summary)
         
         # Individual coin analysis
         st.subheader("Individual Coin Analysis")
+        display_strings = load_display_strings(tuple(selected_coins), mtime)
+        price_charts = build_price_charts(selected_coins, mtime)
         for coin_id in selected_coins:
             st.markdown(f"### {coin_id.capitalize()}")
             
-            # Get price analysis for the coin
-            df, stats = processor.get_price_analysis(coin_id)
+            # Get price data and formatted metrics for the coin
+            df = load_price_data(coin_id, mtime)
+            strings = display_strings[coin_id]
             
             # Display metrics
-            display_coin_metrics(stats, coin_id.capitalize())
+            display_coin_metrics(strings)
             
             # Display price chart
-            st.plotly_chart(create_price_chart(df, coin_id.capitalize()), use_container_width=True)
+            st.plotly_chart(price_charts[coin_id], use_container_width=True)
             
             # Display raw data
             with st.expander("Show Raw Data"):
                 st.dataframe(df)
             
             # Analysis insights
-            if stats['price_change_pct'] > 0:
-                st.success(f"{coin_id.capitalize()} showed a positive trend with a {stats['price_change_pct']:.2f}% increase in price.")
+            if strings['trend_status'] == 'positive':
+                st.success(strings['trend'])
             else:
-                st.error(f"{coin_id.capitalize()} showed a negative trend with a {stats['price_change_pct']:.2f}% decrease in price.")
+                st.error(strings['trend'])
             
-            volatility_level = 'high' if stats['std_price'] > stats['mean_price'] * 0.1 else 'moderate'
-            st.info(f"The price volatility (standard deviation) was ${stats['std_price']:,.2f}, indicating {volatility_level} market volatility.")
+            st.info(strings['volatility'])
             
             st.markdown("---")
         
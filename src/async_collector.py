@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from typing import List, Dict, Optional
+import httpx
+import orjson
+import pandas as pd
+from aiolimiter import AsyncLimiter
+from data_collector import CoinGeckoCollector
+from config import RATE_LIMIT, RETRY_TOTAL, RETRY_BACKOFF_FACTOR, RETRY_STATUSES
+
+logger = logging.getLogger(__name__)
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Get the wait before retrying a request, honoring Retry-After in seconds"""
+    try:
+        return float(response.headers['Retry-After'])
+    except (KeyError, ValueError):
+        return RETRY_BACKOFF_FACTOR * (2 ** attempt)
+
+async def fetch_historical_data(
+    client: httpx.AsyncClient,
+    collector: CoinGeckoCollector,
+    coin_id: str,
+    limiter: AsyncLimiter,
+    semaphore: asyncio.Semaphore
+) -> pd.DataFrame:
+    """Get historical price data for a specific coin without blocking other fetches
+    
+    Responses with a status in RETRY_STATUSES are retried with backoff, the
+    same policy as the synchronous collector's session.
+    """
+    endpoint = f"{collector.base_url}/coins/{coin_id}/market_chart/range"
+    
+    async with semaphore:
+        for attempt in range(RETRY_TOTAL + 1):
+            await limiter.acquire()
+            try:
+                response = await client.get(endpoint, params=collector.get_historical_params())
+            except httpx.HTTPError as e:
+                logger.error(f"Request failed for {coin_id}: {str(e)}")
+                raise
+            
+            if response.status_code in RETRY_STATUSES and attempt < RETRY_TOTAL:
+                delay = _retry_delay(response, attempt)
+                logger.warning(f"Retrying {coin_id} in {delay:.1f}s after HTTP {response.status_code}")
+                await asyncio.sleep(delay)
+                continue
+            
+            if response.status_code != 200:
+                logger.error(f"Error response for {coin_id}: {response.text}")
+                response.raise_for_status()
+            
+            return collector.transform_historical_data(orjson.loads(response.content))
+
+async def collect_and_store_coin_data(
+    client: httpx.AsyncClient,
+    collector: CoinGeckoCollector,
+    coin_id: str,
+    limiter: AsyncLimiter,
+    semaphore: asyncio.Semaphore
+):
+    """Collect and store historical data for a specific coin"""
+    data = await fetch_historical_data(client, collector, coin_id, limiter, semaphore)
+    collector.store_coin_data(data, coin_id)
+
+async def collect_and_store_coins_data(
+    collector: CoinGeckoCollector,
+    coin_ids: List[str],
+    transport: Optional[httpx.AsyncBaseTransport] = None
+) -> Dict[str, Exception]:
+    """Collect and store historical data for several coins concurrently
+    
+    Up to RATE_LIMIT requests are started per minute, so the requests for
+    several coins can go out together. Each coin is stored as soon as its
+    data arrives, and a coin that fails does not affect the others.
+    
+    Args:
+        collector: Collector providing the API key, query parameters, transform and storage
+        coin_ids: List of coin IDs to collect
+        transport: HTTP transport to use, retrying failed connections by default
+        
+    Returns:
+        Dictionary mapping each coin ID that failed to its exception
+    """
+    limiter = AsyncLimiter(RATE_LIMIT, 60)
+    semaphore = asyncio.Semaphore(RATE_LIMIT)
+    headers = {'x-cg-demo-api-key': collector.api_key}
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(retries=RETRY_TOTAL)
+    
+    # Count the collector's recent synchronous request against the limit
+    if time.time() - collector.last_request_time < 60:
+        await limiter.acquire()
+    
+    async with httpx.AsyncClient(headers=headers, transport=transport) as client:
+        results = await asyncio.gather(*[
+            collect_and_store_coin_data(client, collector, coin_id, limiter, semaphore)
+            for coin_id in coin_ids
+        ], return_exceptions=True)
+    
+    return {
+        coin_id: result
+        for coin_id, result in zip(coin_ids, results)
+        if isinstance(result, Exception)
+    }
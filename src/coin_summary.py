@@ -0,0 +1,71 @@
+import sqlite3
+import math
+
+def create_summary_table(conn: sqlite3.Connection):
+    """Create the coin_summary table if it doesn't exist"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS coin_summary (
+            coin_id TEXT PRIMARY KEY,
+            mean REAL,
+            std REAL,
+            min REAL,
+            max REAL,
+            first_price REAL,
+            last_price REAL,
+            change_pct REAL,
+            updated_at INTEGER
+        )
+    """)
+
+def update_coin_summary(conn: sqlite3.Connection, coin_id: str):
+    """Recompute the summary statistics of a coin from its stored prices"""
+    # SQLite builds do not always include math functions
+    conn.create_function("sqrt", 1, math.sqrt, deterministic=True)
+    
+    # Standard deviation is the sample deviation, matching pandas
+    conn.execute("""
+        WITH prices AS (
+            SELECT date, price FROM crypto_prices WHERE coin_id = :coin_id
+        ),
+        stats AS (
+            SELECT AVG(price) AS mean, MIN(price) AS min, MAX(price) AS max, COUNT(*) AS n
+            FROM prices
+        ),
+        deviations AS (
+            SELECT SUM((prices.price - stats.mean) * (prices.price - stats.mean)) AS ss
+            FROM prices, stats
+        ),
+        endpoints AS (
+            SELECT
+                (SELECT price FROM prices ORDER BY date ASC LIMIT 1) AS first_price,
+                (SELECT price FROM prices ORDER BY date DESC LIMIT 1) AS last_price
+        )
+        INSERT OR REPLACE INTO coin_summary
+        (coin_id, mean, std, min, max, first_price, last_price, change_pct, updated_at)
+        SELECT
+            :coin_id,
+            stats.mean,
+            CASE WHEN stats.n > 1 THEN sqrt(deviations.ss / (stats.n - 1)) END,
+            stats.min,
+            stats.max,
+            endpoints.first_price,
+            endpoints.last_price,
+            (endpoints.last_price - endpoints.first_price) / endpoints.first_price * 100,
+            CAST(strftime('%s', 'now') AS INTEGER)
+        FROM stats, deviations, endpoints
+        WHERE stats.n > 0
+    """, {'coin_id': coin_id})
+
+def backfill_coin_summary(conn: sqlite3.Connection) -> list[str]:
+    """Compute the summary of every stored coin that doesn't have one yet
+    
+    Returns:
+        List of the coin IDs that were summarized
+    """
+    coin_ids = [row[0] for row in conn.execute("""
+        SELECT DISTINCT coin_id FROM crypto_prices
+        WHERE coin_id NOT IN (SELECT coin_id FROM coin_summary)
+    """)]
+    for coin_id in coin_ids:
+        update_coin_summary(conn, coin_id)
+    return coin_ids
@@ -14,5 +14,14 @@ END_DATE = datetime(2025, 3, 31, 23, 59, 59, tzinfo=timezone.utc)   # End of Q1
 # Moving Average Configuration
 MOVING_AVERAGE_WINDOW = 5
 
+# Chart Configuration
+MAX_CHART_POINTS = 2000  # points per trace sent to the browser
+CHART_WORKERS = 4  # threads building per-coin charts
+
 # API Rate Limiting
-RATE_LIMIT = 10  # requests per minute 
\ No newline at end of file
+RATE_LIMIT = 10  # requests per minute
+
+# API Retries
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5  # seconds, doubled on each retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
@@ -1,17 +1,27 @@
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sqlite3
-from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from datetime import timezone
 import time
+from contextlib import contextmanager
 from typing import List, Dict, Any
 import logging
 import os
 from dotenv import load_dotenv
+import coin_summary
 from config import (
     COINGECKO_API_BASE_URL,
     DB_PATH,
     START_DATE,
     END_DATE,
-    RATE_LIMIT
+    RATE_LIMIT,
+    RETRY_TOTAL,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUSES
 )
 
 # Load environment variables using absolute path
@@ -22,10 +32,18 @@ load_dotenv(env_path)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# HTTP session shared by all collectors so kept-alive connections are reused
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR, status_forcelist=RETRY_STATUSES)
+))
+
 class CoinGeckoCollector:
     def __init__(self):
         self.base_url = COINGECKO_API_BASE_URL
-        self.session = requests.Session()
+        self.session = _SESSION
         self.last_request_time = 0
         self.min_request_interval = 60 / RATE_LIMIT
         self.all_coins = []
@@ -41,8 +59,53 @@ class CoinGeckoCollector:
             'x-cg-demo-api-key': self.api_key
         })
         
+        # Open a single database connection for the collector's lifetime
+        self.conn = self._connect()
+        
         # Create database if it doesn't exist
-        self.create_database()
+        try:
+            self.create_database()
+        except Exception:
+            self.conn.close()
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database connection used for all writes"""
+        # Create directory if needed
+        if self.DB_PATH:
+            db_dir = os.path.dirname(self.DB_PATH)
+            if db_dir:  # Only create directory if there's a path and path doesn't already exist
+                os.makedirs(db_dir, exist_ok=True)
+        
+        # Autocommit mode; transactions are opened explicitly where needed
+        conn = sqlite3.connect(self.DB_PATH, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed writes in a single transaction
+        
+        Joins the transaction that is already open, if any, so that writes
+        can be grouped by their callers.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        
+        self.conn.execute("BEGIN")
+        try:
+            yield
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
 
     def rate_limit(self, delay=None):
         """Implement rate limiting for API requests"""
@@ -73,61 +136,55 @@ class CoinGeckoCollector:
                 return coin['id']
         return None
 
-    def get_historical_data(self, coin_id: str) -> List[Dict[str, Any]]:
-        """Get historical price data for a specific coin"""
-        self.rate_limit()
-        endpoint = f"{self.base_url}/coins/{coin_id}/market_chart/range"
-        
+    def get_historical_params(self) -> Dict[str, Any]:
+        """Get the query parameters for the historical data endpoint"""
         # Calculate timestamps using midnight UTC from config dates
         from_timestamp = int(START_DATE.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc).timestamp())
         to_timestamp = int(END_DATE.replace(hour=23, minute=59, second=59, microsecond=0, tzinfo=timezone.utc).timestamp())
         
-        params = {
+        return {
             'vs_currency': 'usd',
             'from': from_timestamp,
             'to': to_timestamp
         }
+
+    def transform_historical_data(self, data: Dict[str, Any]) -> pd.DataFrame:
+        """Transform a market chart response to match our database schema"""
+        logger.info(f"Response data keys: {data.keys() if isinstance(data, dict) else 'Not a dict'}")
+        
+        # Each series is a list of [timestamp_ms, value] pairs
+        prices = np.asarray(data['prices'], dtype=np.float64).reshape(-1, 2)
+        market_caps = np.asarray(data['market_caps'], dtype=np.float64).reshape(-1, 2)
+        volumes = np.asarray(data['total_volumes'], dtype=np.float64).reshape(-1, 2)
+        
+        # Convert millisecond timestamps to UTC days since the epoch
+        dates = (prices[:, 0] // 86_400_000).astype(np.int64)
+        
+        # Sort data by date, keeping the API order within a day
+        order = np.argsort(dates, kind='stable')
+        transformed_data = pd.DataFrame({
+            'date': dates[order],
+            'price': prices[order, 1],
+            'market_cap': market_caps[order, 1],
+            'volume': volumes[order, 1]
+        })
+        
+        logger.info(f"Retrieved {len(transformed_data)} data points for {START_DATE.strftime('%Y-%m-%d')} to {END_DATE.strftime('%Y-%m-%d')}")
+        return transformed_data
+
+    def get_historical_data(self, coin_id: str) -> pd.DataFrame:
+        """Get historical price data for a specific coin"""
+        self.rate_limit()
+        endpoint = f"{self.base_url}/coins/{coin_id}/market_chart/range"
         
         try:
-            response = self.session.get(endpoint, params=params)
+            response = self.session.get(endpoint, params=self.get_historical_params())
             
             if response.status_code != 200:
                 logger.error(f"Error response: {response.text}")
                 response.raise_for_status()
                 
-            data = response.json()
-            logger.info(f"Response data keys: {data.keys() if isinstance(data, dict) else 'Not a dict'}")
-            
-            # Transform the data to match our database schema
-            transformed_data = []
-            for i in range(len(data['prices'])):
-                timestamp, price = data['prices'][i]
-                _, market_cap = data['market_caps'][i]
-                _, volume = data['total_volumes'][i]
-                
-                # Convert timestamp to date string
-                date = datetime.fromtimestamp(timestamp/1000).strftime('%Y-%m-%d')
-                
-                transformed_data.append({
-                    'date': date,
-                    'market_data': {
-                        'current_price': {
-                            'usd': price
-                        },
-                        'market_cap': {
-                            'usd': market_cap
-                        },
-                        'total_volume': {
-                            'usd': volume
-                        }
-                    }
-                })
-            
-            # Sort data by date
-            transformed_data.sort(key=lambda x: x['date'])
-            
-            logger.info(f"Retrieved {len(transformed_data)} data points for {START_DATE.strftime('%Y-%m-%d')} to {END_DATE.strftime('%Y-%m-%d')}")
-            return transformed_data
+            return self.transform_historical_data(orjson.loads(response.content))
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Request failed: {str(e)}")
@@ -136,21 +193,28 @@ class CoinGeckoCollector:
             raise
 
     def create_database(self):
-        """Create the database and tables if they don't exist"""
-        # Create directory if needed
-        if self.DB_PATH:
-            db_dir = os.path.dirname(self.DB_PATH)
-            if db_dir:  # Only create directory if there's a path and path doesn't already exist
-                os.makedirs(db_dir, exist_ok=True)
+        """Create the database and tables if they don't exist
         
-        conn = sqlite3.connect(self.DB_PATH)
-        cursor = conn.cursor()
+        Raises:
+            ValueError: If an existing crypto_prices table still stores dates as text
+        """
+        cursor = self.conn.cursor()
         
         try:
+            # Databases from earlier versions must be migrated before new
+            # rows are added next to their text dates
+            columns = {row[1]: row[2] for row in cursor.execute("PRAGMA table_info(crypto_prices)")}
+            if columns and columns['date'].upper() != 'INTEGER':
+                logger.error(f"crypto_prices.date in {self.DB_PATH} is stored as {columns['date']}")
+                raise ValueError(
+                    f"Database at {self.DB_PATH} stores dates as {columns['date']}. "
+                    "Run python src/migrate_dates.py to convert it first"
+                )
+            
             # Create crypto_prices table with composite primary key
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS crypto_prices (
-                    date TEXT NOT NULL,
+                    date INTEGER NOT NULL,  -- days since 1970-01-01 (UTC)
                     coin_id TEXT NOT NULL,
                     price REAL NOT NULL,
                     market_cap REAL NOT NULL,
@@ -158,36 +222,44 @@ class CoinGeckoCollector:
                     PRIMARY KEY (date, coin_id)
                 )
             """)
-            conn.commit()
+
+            # Index for per-coin range reads
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS ix_coin_date
+                ON crypto_prices (coin_id, date)
+            """)
         finally:
             cursor.close()
-            conn.close()
+        
+        # Per-coin statistics, refreshed whenever a coin's data is stored.
+        # Summarize coins stored before the table existed.
+        coin_summary.create_summary_table(self.conn)
+        coin_summary.backfill_coin_summary(self.conn)
 
-    def save_to_database(self, data: List[Dict[str, Any]], coin_id: str):
+    def save_to_database(self, data: pd.DataFrame, coin_id: str):
         """Save historical data to SQLite database"""
-        conn = sqlite3.connect(self.DB_PATH)
-        cursor = conn.cursor()
+        rows = zip(
+            data['date'].tolist(),
+            [coin_id] * len(data),
+            data['price'].tolist(),
+            data['market_cap'].tolist(),
+            data['volume'].tolist()
+        )
         
-        try:
-            for entry in data:
-                date = entry['date']
-                price = entry['market_data']['current_price']['usd']
-                market_cap = entry['market_data']['market_cap']['usd']
-                volume = entry['market_data']['total_volume']['usd']
-                
-                # Use INSERT OR REPLACE to update existing records
-                cursor.execute("""
-                    INSERT OR REPLACE INTO crypto_prices 
-                    (date, coin_id, price, market_cap, volume)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (date, coin_id, price, market_cap, volume))
-            
-            conn.commit()
-        finally:
-            cursor.close()
-            conn.close()
+        # Write all rows in a single transaction
+        with self.transaction():
+            # Use INSERT OR REPLACE to update existing records
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO crypto_prices 
+                (date, coin_id, price, market_cap, volume)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+
+    def update_coin_summary(self, coin_id: str):
+        """Recompute the summary statistics of a coin from its stored prices"""
+        coin_summary.update_coin_summary(self.conn, coin_id)
 
-    def collect_coin_data(self, coin_id: str) -> List[Dict[str, Any]]:
+    def collect_coin_data(self, coin_id: str) -> pd.DataFrame:
         """Collect historical data for a specific coin"""
         try:
             logger.info(f"Starting data collection process for coin ID: {coin_id}")
@@ -202,11 +274,13 @@ class CoinGeckoCollector:
             logger.error(f"Error during data collection: {str(e)}")
             raise
 
-    def store_coin_data(self, data: List[Dict[str, Any]], coin_id: str):
+    def store_coin_data(self, data: pd.DataFrame, coin_id: str):
         """Store historical data for a specific coin"""
         try:
-            # Save to database
-            self.save_to_database(data, coin_id)
+            # Save to database, committing the prices with their summary
+            with self.transaction():
+                self.save_to_database(data, coin_id)
+                self.update_coin_summary(coin_id)
             logger.info(f"Data successfully saved to database for coin ID: {coin_id}")
         except Exception as e:
             logger.error(f"Error during data storage: {str(e)}")
@@ -1,16 +1,101 @@
+import os
+import numpy as np
 import pandas as pd
 import sqlite3
 from typing import Tuple, Dict, Any, Optional
 from config import DB_PATH, MOVING_AVERAGE_WINDOW
 
+# Compile the pandas rolling window with numba and release the GIL while it runs
+NUMBA_ENGINE_KWARGS = {'nopython': True, 'nogil': True, 'parallel': False}
+
+try:
+    # Ahead-of-time build from _kernels_aot, which has no start-up cost
+    from crypto_kernels import rolling_mean
+except ImportError:
+    rolling_mean = None
+
+def compile_numba_kernels():
+    """Compile the pandas numba kernels ahead of the first request
+    
+    pandas keeps its numba kernels in memory only, so a long-running
+    process such as the dashboard calls this once at start-up rather than
+    paying the compilation on the first rerun.
+    """
+    if rolling_mean is None:
+        pd.Series(np.zeros(MOVING_AVERAGE_WINDOW)).rolling(window=MOVING_AVERAGE_WINDOW).mean(
+            engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS
+        )
+    
+    grouped = pd.Series(np.zeros(2)).groupby(pd.Categorical(['a', 'b']), observed=True)
+    for aggregation in ('mean', 'std', 'min', 'max'):
+        getattr(grouped, aggregation)(engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS)
+
 class DataProcessor:
     def __init__(self, db_path=None):
         """Initialize the data processor"""
         self.db_path = db_path if db_path is not None else DB_PATH
+        
+        # In-memory copy of the crypto_prices table, invalidated when the
+        # database file changes on disk
+        self._cached_data: Optional[pd.DataFrame] = None
+        self._cached_mtime: Optional[float] = None
+
+    def get_db_mtime(self) -> float:
+        """Get the last modification time of the database
+        
+        Writes land in the write-ahead log before they are checkpointed
+        into the main file, so the log is checked as well.
+        """
+        mtime = os.path.getmtime(self.db_path)
+        wal_path = f"{self.db_path}-wal"
+        if os.path.exists(wal_path):
+            mtime = max(mtime, os.path.getmtime(wal_path))
+        return mtime
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read connection to the database"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA cache_size = -65536")
+        return conn
 
     def calculate_moving_average(self, df: pd.DataFrame) -> pd.Series:
         """Calculate moving average for price data"""
-        return df['price'].rolling(window=MOVING_AVERAGE_WINDOW).mean()
+        if rolling_mean is not None:
+            prices = df['price'].to_numpy(dtype=np.float64)
+            return pd.Series(rolling_mean(prices, MOVING_AVERAGE_WINDOW), index=df.index)
+        return df['price'].rolling(window=MOVING_AVERAGE_WINDOW).mean(
+            engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS
+        )
+
+    def get_price_data(self, coin_id: str) -> pd.DataFrame:
+        """Get price data with moving average for a specific coin
+        
+        Args:
+            coin_id: The ID of the coin
+            
+        Returns:
+            DataFrame with price data and moving average, ordered by date
+            
+        Raises:
+            ValueError: If no data is found for the given coin_id
+        """
+        # Slice the coin from the cached table instead of querying again.
+        # Rows are ordered by coin_id, so each coin is a contiguous block
+        # that can be located by binary search on the category codes.
+        all_data = self.get_all_coins_data()
+        categories = all_data['coin_id'].cat.categories
+        if coin_id not in categories:
+            raise ValueError(f"No data found for coin ID: {coin_id}")
+        
+        code = categories.get_loc(coin_id)
+        start, end = np.searchsorted(all_data['coin_id'].cat.codes.to_numpy(), [code, code + 1])
+        df = all_data.iloc[start:end].reset_index(drop=True)
+        
+        # Calculate moving average
+        df['moving_average'] = self.calculate_moving_average(df)
+        
+        return df
 
     def get_price_analysis(self, coin_id: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Get price analysis for a specific coin
@@ -26,25 +111,7 @@ class DataProcessor:
         Raises:
             ValueError: If no data is found for the given coin_id
         """
-        # Connect to the database
-        conn = sqlite3.connect(self.db_path)
-        
-        # Read the data into a pandas DataFrame
-        query = "SELECT * FROM crypto_prices WHERE coin_id = ?"
-        df = pd.read_sql_query(query, conn, params=(coin_id,))
-        conn.close()
-        
-        if df.empty:
-            raise ValueError(f"No data found for coin ID: {coin_id}")
-        
-        # Convert date string to datetime
-        df['date'] = pd.to_datetime(df['date'])
-        
-        # Sort by date
-        df = df.sort_values('date')
-        
-        # Calculate moving average
-        df['moving_average'] = self.calculate_moving_average(df)
+        df = self.get_price_data(coin_id)
         
         # Calculate price change percentage
         first_price = df['price'].iloc[0]
@@ -57,8 +124,7 @@ class DataProcessor:
             'std_price': df['price'].std(),
             'min_price': df['price'].min(),
             'max_price': df['price'].max(),
-            'price_change_pct': price_change_pct,
-            'moving_average': df['moving_average'].tolist()
+            'price_change_pct': price_change_pct
         }
         
         return df, analysis
@@ -66,55 +132,139 @@ class DataProcessor:
     def get_all_coins_data(self) -> pd.DataFrame:
         """Get price data for all coins in the database
         
+        The table is read once and kept in memory until the database file
+        is modified.
+        
         Returns:
-            DataFrame containing price data for all coins
+            DataFrame containing price data for all coins, ordered by coin_id and date
         """
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query("SELECT * FROM crypto_prices", conn)
-        conn.close()
+        mtime = self.get_db_mtime()
+        if self._cached_data is not None and self._cached_mtime == mtime:
+            return self._cached_data
+        
+        conn = self._connect()
+        try:
+            # Set column types while building the DataFrame
+            df = pd.read_sql_query(
+                "SELECT * FROM crypto_prices ORDER BY coin_id, date",
+                conn,
+                dtype={
+                    'date': np.int64,
+                    'coin_id': 'category',
+                    'price': np.float64,
+                    'market_cap': np.float64,
+                    'volume': np.float64
+                }
+            )
+        finally:
+            conn.close()
         
         if df.empty:
             raise ValueError("No data found in the database")
-            
-        # Convert date string to datetime
-        df['date'] = pd.to_datetime(df['date'])
         
-        # Sort by date and coin_id
-        df = df.sort_values(['date', 'coin_id'])
+        # Dates are stored as days since the epoch
+        df['date'] = pd.to_datetime(df['date'], unit='D')
+        
+        self._cached_data = df
+        self._cached_mtime = mtime
         
         return df
 
-    def get_coin_comparison(self, coin_ids: list[str]) -> Dict[str, Any]:
-        """Compare multiple coins based on their price performance
+    def _summarize_prices(self, all_data: pd.DataFrame, coin_ids: list[str]) -> pd.DataFrame:
+        """Compute coin_summary rows for the given coins from price data"""
+        codes = all_data['coin_id'].cat.categories.get_indexer(coin_ids)
+        coin_data = all_data[all_data['coin_id'].cat.codes.isin(codes[codes >= 0])]
+        
+        grouped = coin_data.groupby('coin_id', sort=False, observed=True)['price']
+        
+        # first and last have no numba engine
+        summary = pd.DataFrame({
+            'mean': grouped.mean(engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS),
+            'std': grouped.std(engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS),
+            'min': grouped.min(engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS),
+            'max': grouped.max(engine='numba', engine_kwargs=NUMBA_ENGINE_KWARGS),
+            'first_price': grouped.first(),
+            'last_price': grouped.last()
+        })
+        summary['change_pct'] = (summary['last_price'] - summary['first_price']) / summary['first_price'] * 100
+        summary['updated_at'] = None
+        summary.index = summary.index.astype(str).rename('coin_id')
+        
+        return summary
+
+    def get_summary(self, coin_ids: Optional[list[str]] = None) -> pd.DataFrame:
+        """Get the precomputed summary statistics of the stored coins
+        
+        Coins without a row in coin_summary, for example in a database
+        collected before the table existed, are summarized from the cached
+        price data instead.
         
         Args:
-            coin_ids: List of coin IDs to compare
+            coin_ids: List of coin IDs to include. All coins are returned if not provided.
             
         Returns:
-            Dictionary containing comparison metrics
+            DataFrame indexed by coin_id with one row of statistics per coin
+            
+        Raises:
+            ValueError: If no data is found for one of the given coin_ids
         """
+        conn = self._connect()
+        try:
+            has_table = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'coin_summary'"
+            ).fetchone() is not None
+            summary = pd.read_sql_query("SELECT * FROM coin_summary", conn, index_col='coin_id') if has_table else None
+        finally:
+            conn.close()
+        
         all_data = self.get_all_coins_data()
+        requested = coin_ids if coin_ids is not None else all_data['coin_id'].cat.categories.tolist()
+        unsummarized = [coin_id for coin_id in requested if summary is None or coin_id not in summary.index]
+        if unsummarized:
+            summary = pd.concat([summary, self._summarize_prices(all_data, unsummarized)])
         
-        # Filter data for requested coins
-        coin_data = all_data[all_data['coin_id'].isin(coin_ids)]
+        if coin_ids is not None:
+            missing = [coin_id for coin_id in coin_ids if coin_id not in summary.index]
+            if missing:
+                raise ValueError(f"No data found for coins: {missing}")
+            summary = summary.loc[coin_ids]
         
-        if coin_data.empty:
-            raise ValueError(f"No data found for any of the coins: {coin_ids}")
+        return summary
+
+    def format_display_strings(self, summary: pd.DataFrame) -> Dict[str, Dict[str, str]]:
+        """Format the dashboard text of each coin from its summary statistics
         
-        # Calculate metrics for each coin
-        comparison = {}
-        for coin_id in coin_ids:
-            coin_df = coin_data[coin_data['coin_id'] == coin_id]
-            first_price = coin_df['price'].iloc[0]
-            last_price = coin_df['price'].iloc[-1]
-            price_change = ((last_price - first_price) / first_price) * 100
+        Args:
+            summary: Summary statistics, as returned by get_summary
             
-            comparison[coin_id] = {
-                'price_change_pct': price_change,
-                'mean_price': coin_df['price'].mean(),
-                'volatility': coin_df['price'].std(),
-                'max_price': coin_df['price'].max(),
-                'min_price': coin_df['price'].min()
-            }
-        
-        return comparison 
\ No newline at end of file
+        Returns:
+            Dictionary mapping each coin ID to its formatted metrics and insights
+        """
+        names = pd.Series(summary.index.str.capitalize(), index=summary.index)
+        positive = summary['change_pct'] > 0
+        trend_status = pd.Series(np.where(positive, 'positive', 'negative'), index=summary.index)
+        trend_change = pd.Series(np.where(positive, 'increase', 'decrease'), index=summary.index)
+        volatility_level = pd.Series(
+            np.where(summary['std'] > summary['mean'] * 0.1, 'high', 'moderate'),
+            index=summary.index
+        )
+        std_price = summary['std'].map('${:,.2f}'.format)
+        
+        strings = pd.DataFrame({
+            'mean_price': summary['mean'].map('${:,.2f}'.format),
+            'std_price': std_price,
+            'min_price': summary['min'].map('${:,.2f}'.format),
+            'max_price': summary['max'].map('${:,.2f}'.format),
+            'price_change_pct': summary['change_pct'].map('{:.2f}%'.format),
+            'trend_status': trend_status,
+            'trend': (
+                names + ' showed a ' + trend_status + ' trend with a '
+                + summary['change_pct'].map('{:.2f}'.format) + '% ' + trend_change + ' in price.'
+            ),
+            'volatility': (
+                'The price volatility (standard deviation) was ' + std_price
+                + ', indicating ' + volatility_level + ' market volatility.'
+            )
+        })
+        
+        return strings.to_dict(orient='index')
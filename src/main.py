@@ -1,8 +1,9 @@
-import os
+import asyncio
 import logging
 from data_collector import CoinGeckoCollector
+from async_collector import collect_and_store_coins_data
 from data_processor import DataProcessor
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 import pandas as pd
 
 logging.basicConfig(
@@ -11,47 +12,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def collect_and_analyze_coin(coin_name: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
-    """Collect and analyze data for a specific coin"""
+def collect_and_analyze_coins(coin_names: List[str]) -> Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]]:
+    """Collect data for several coins concurrently and analyze each of them
+    
+    Coins that cannot be found or collected are logged and left out of the
+    results, while the other coins are still stored and analyzed.
+    """
+    collector = CoinGeckoCollector()
     try:
-        # Initialize collector and get coin ID
-        collector = CoinGeckoCollector()
+        # Resolve all coin IDs from a single coin list request
         collector.get_all_coins()
-        coin_id = collector.get_coin_id(coin_name)
+        coin_ids = {}
+        for coin_name in coin_names:
+            coin_id = collector.get_coin_id(coin_name)
+            if coin_id is None:
+                logger.error(f"Error processing {coin_name}: Coin '{coin_name}' not found")
+                continue
+            logger.info(f"Found {coin_name} ID: {coin_id}")
+            coin_ids[coin_name] = coin_id
         
-        if coin_id is None:
-            raise ValueError(f"Coin '{coin_name}' not found")
-            
-        logger.info(f"Found {coin_name} ID: {coin_id}")
-        
-        # Collect and store data
-        collector.collect_and_store_coin_data(coin_id)
-        
-        # Analyze data
-        processor = DataProcessor()
-        df, stats = processor.get_price_analysis(coin_id)
-        
-        return df, stats
-        
-    except Exception as e:
-        logger.error(f"Error processing {coin_name}: {str(e)}")
-        raise
+        # Fetch and store all coins concurrently
+        failures = asyncio.run(collect_and_store_coins_data(collector, list(coin_ids.values())))
+    finally:
+        collector.close()
+    
+    for coin_name, coin_id in list(coin_ids.items()):
+        if coin_id in failures:
+            logger.error(f"Error processing {coin_name}: {str(failures[coin_id])}")
+            del coin_ids[coin_name]
+    
+    # Analyze data
+    processor = DataProcessor()
+    return {
+        coin_name: processor.get_price_analysis(coin_id)
+        for coin_name, coin_id in coin_ids.items()
+    }
 
 def main():
     try:
         # List of coins to analyze
         coins = ["Bitcoin"]
         
-        for coin in coins:
-            logger.info(f"Processing {coin}...")
-            df, stats = collect_and_analyze_coin(coin)
-            
+        logger.info(f"Processing {', '.join(coins)}...")
+        results = collect_and_analyze_coins(coins)
+        
+        for coin, (df, stats) in results.items():
             # Log analysis results
             logger.info(f"Analysis completed successfully for {coin}")
             logger.info(f"Mean price: ${stats['mean_price']:,.2f}")
             logger.info(f"Price change: {stats['price_change_pct']:.2f}%")
             logger.info("-" * 50)
         
+        failed = [coin for coin in coins if coin not in results]
+        if failed:
+            raise RuntimeError(f"Failed to process coins: {', '.join(failed)}")
+        
     except Exception as e:
         logger.error(f"Error in main process: {str(e)}")
         raise
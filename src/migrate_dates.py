@@ -0,0 +1,92 @@
+import sqlite3
+import logging
+import coin_summary
+from config import DB_PATH
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def _convert_dates(conn: sqlite3.Connection):
+    """Rebuild crypto_prices with dates stored as days since the epoch
+    
+    Raises:
+        ValueError: If a stored date is not in 'YYYY-MM-DD' format
+    """
+    # julianday() would read a bare number as a Julian day, so only convert
+    # tables whose dates are all text dates
+    invalid = [row[0] for row in conn.execute("""
+        SELECT DISTINCT date FROM crypto_prices
+        WHERE date NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+        LIMIT 5
+    """)]
+    if invalid:
+        logger.error(f"Found dates not in YYYY-MM-DD format: {invalid}")
+        raise ValueError(f"Cannot convert dates not in YYYY-MM-DD format: {invalid}")
+    
+    conn.execute("BEGIN")
+    try:
+        conn.execute("""
+            CREATE TABLE crypto_prices_new (
+                date INTEGER NOT NULL,  -- days since 1970-01-01 (UTC)
+                coin_id TEXT NOT NULL,
+                price REAL NOT NULL,
+                market_cap REAL NOT NULL,
+                volume REAL NOT NULL,
+                PRIMARY KEY (date, coin_id)
+            )
+        """)
+        conn.execute("""
+            INSERT INTO crypto_prices_new (date, coin_id, price, market_cap, volume)
+            SELECT CAST(julianday(date) - julianday('1970-01-01') AS INTEGER),
+                   coin_id, price, market_cap, volume
+            FROM crypto_prices
+        """)
+        conn.execute("DROP TABLE crypto_prices")
+        conn.execute("ALTER TABLE crypto_prices_new RENAME TO crypto_prices")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS ix_coin_date
+            ON crypto_prices (coin_id, date)
+        """)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+def migrate_dates(db_path: str = DB_PATH):
+    """Bring a database created by an earlier version up to the current schema
+    
+    Converts crypto_prices.date from 'YYYY-MM-DD' text to days since the
+    epoch, then creates coin_summary and fills in the coins that have no
+    summary yet. Steps that are already done are skipped, so running it
+    more than once is safe.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    
+    try:
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(crypto_prices)")}
+        if not columns:
+            logger.info("No crypto_prices table found, nothing to migrate")
+            return
+        
+        converted = columns['date'].upper() != 'INTEGER'
+        if converted:
+            _convert_dates(conn)
+            count = conn.execute("SELECT COUNT(*) FROM crypto_prices").fetchone()[0]
+            logger.info(f"Migrated {count} rows to integer dates")
+        else:
+            logger.info("Dates are already stored as integers")
+        
+        coin_summary.create_summary_table(conn)
+        if converted:
+            # Summaries computed before the conversion ordered the text dates
+            conn.execute("DELETE FROM coin_summary")
+        summarized = coin_summary.backfill_coin_summary(conn)
+        logger.info(f"Computed summaries for {len(summarized)} coins")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate_dates()
@@ -0,0 +1,11 @@
+import pytest
+import data_collector
+from data_collector import CoinGeckoCollector
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.setenv('COINGECKO_API_KEY', 'test-key')
+    monkeypatch.setattr(data_collector, 'DB_PATH', str(tmp_path / "crypto.db"))
+    collector = CoinGeckoCollector()
+    yield collector
+    collector.close()
@@ -0,0 +1,76 @@
+import asyncio
+import time
+import httpx
+import async_collector
+from async_collector import collect_and_store_coins_data
+
+DAY_MS = 86_400_000
+
+def market_chart(price):
+    return {
+        'prices': [[20089 * DAY_MS, price], [20090 * DAY_MS, price + 1]],
+        'market_caps': [[20089 * DAY_MS, 1.0], [20090 * DAY_MS, 1.0]],
+        'total_volumes': [[20089 * DAY_MS, 2.0], [20090 * DAY_MS, 2.0]]
+    }
+
+def coin_from(request):
+    return request.url.path.split('/')[-3]
+
+def stored_coins(collector):
+    rows = collector.conn.execute("SELECT DISTINCT coin_id FROM crypto_prices ORDER BY coin_id")
+    return [coin_id for coin_id, in rows]
+
+def test_requests_burst_within_rate_limit(collector):
+    coin_ids = ['bitcoin', 'ethereum', 'solana']
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=market_chart(100.0)))
+    
+    start = time.perf_counter()
+    failures = asyncio.run(collect_and_store_coins_data(collector, coin_ids, transport=transport))
+    
+    assert failures == {}
+    assert time.perf_counter() - start < 1
+    assert stored_coins(collector) == sorted(coin_ids)
+
+def test_retries_rate_limited_responses(collector):
+    calls = []
+    
+    def handler(request):
+        calls.append(coin_from(request))
+        if len(calls) == 1:
+            return httpx.Response(429, headers={'Retry-After': '0'})
+        return httpx.Response(200, json=market_chart(100.0))
+    
+    failures = asyncio.run(collect_and_store_coins_data(collector, ['bitcoin'], transport=httpx.MockTransport(handler)))
+    
+    assert failures == {}
+    assert calls == ['bitcoin', 'bitcoin']
+    assert stored_coins(collector) == ['bitcoin']
+
+def test_gives_up_after_retry_total(collector, monkeypatch):
+    monkeypatch.setattr(async_collector, 'RETRY_BACKOFF_FACTOR', 0)
+    calls = []
+    
+    def handler(request):
+        calls.append(coin_from(request))
+        return httpx.Response(503)
+    
+    failures = asyncio.run(collect_and_store_coins_data(collector, ['bitcoin'], transport=httpx.MockTransport(handler)))
+    
+    assert isinstance(failures['bitcoin'], httpx.HTTPStatusError)
+    assert len(calls) == async_collector.RETRY_TOTAL + 1
+
+def test_failed_coin_does_not_discard_others(collector):
+    def handler(request):
+        if coin_from(request) == 'ethereum':
+            return httpx.Response(404, text="coin not found")
+        return httpx.Response(200, json=market_chart(100.0))
+    
+    failures = asyncio.run(collect_and_store_coins_data(
+        collector, ['bitcoin', 'ethereum', 'solana'], transport=httpx.MockTransport(handler)
+    ))
+    
+    assert list(failures) == ['ethereum']
+    assert isinstance(failures['ethereum'], httpx.HTTPStatusError)
+    assert stored_coins(collector) == ['bitcoin', 'solana']
+    summary = collector.conn.execute("SELECT coin_id FROM coin_summary ORDER BY coin_id").fetchall()
+    assert summary == [('bitcoin',), ('solana',)]
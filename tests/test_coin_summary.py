@@ -0,0 +1,117 @@
+import sqlite3
+import pandas as pd
+import pytest
+import coin_summary
+from data_processor import DataProcessor
+
+PRICES = {
+    'bitcoin': [(20089, 100.0), (20090, 110.0), (20091, 90.0), (20092, 120.0)],
+    'ethereum': [(20089, 10.0), (20090, 12.0)],
+    'solana': [(20089, 5.0)]
+}
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "crypto.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE crypto_prices (
+            date INTEGER NOT NULL,
+            coin_id TEXT NOT NULL,
+            price REAL NOT NULL,
+            market_cap REAL NOT NULL,
+            volume REAL NOT NULL,
+            PRIMARY KEY (date, coin_id)
+        )
+    """)
+    # Insert out of date order to check first/last use the date, not rowid
+    rows = [
+        (date, coin_id, price, 0.0, 0.0)
+        for coin_id, prices in PRICES.items()
+        for date, price in reversed(prices)
+    ]
+    conn.executemany("INSERT INTO crypto_prices VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return path
+
+def expected_summary(coin_id):
+    prices = pd.Series([price for _, price in PRICES[coin_id]])
+    return {
+        'mean': prices.mean(),
+        'std': prices.std(),
+        'min': prices.min(),
+        'max': prices.max(),
+        'first_price': prices.iloc[0],
+        'last_price': prices.iloc[-1],
+        'change_pct': (prices.iloc[-1] - prices.iloc[0]) / prices.iloc[0] * 100
+    }
+
+def read_summary(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query("SELECT * FROM coin_summary", conn, index_col='coin_id')
+    finally:
+        conn.close()
+
+def assert_matches_prices(summary, coin_id):
+    for column, value in expected_summary(coin_id).items():
+        if pd.isna(value):
+            assert pd.isna(summary.loc[coin_id, column]), column
+        else:
+            assert summary.loc[coin_id, column] == pytest.approx(value), column
+
+def test_update_coin_summary_matches_pandas(db_path):
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    coin_summary.create_summary_table(conn)
+    for coin_id in PRICES:
+        coin_summary.update_coin_summary(conn, coin_id)
+    conn.close()
+    
+    summary = read_summary(db_path)
+    for coin_id in PRICES:
+        assert_matches_prices(summary, coin_id)
+    # A single price has no sample standard deviation
+    assert pd.isna(summary.loc['solana', 'std'])
+
+def test_update_coin_summary_ignores_unknown_coin(db_path):
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    coin_summary.create_summary_table(conn)
+    coin_summary.update_coin_summary(conn, 'dogecoin')
+    conn.close()
+    
+    assert read_summary(db_path).empty
+
+def test_backfill_only_fills_missing_coins(db_path):
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    coin_summary.create_summary_table(conn)
+    coin_summary.update_coin_summary(conn, 'bitcoin')
+    
+    assert sorted(coin_summary.backfill_coin_summary(conn)) == ['ethereum', 'solana']
+    assert coin_summary.backfill_coin_summary(conn) == []
+    conn.close()
+    
+    assert sorted(read_summary(db_path).index) == sorted(PRICES)
+
+def test_get_summary_without_summary_table(db_path):
+    summary = DataProcessor(db_path=db_path).get_summary(['ethereum', 'bitcoin'])
+    
+    assert summary.index.tolist() == ['ethereum', 'bitcoin']
+    assert_matches_prices(summary, 'bitcoin')
+    assert_matches_prices(summary, 'ethereum')
+
+def test_get_summary_fills_in_missing_rows(db_path):
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    coin_summary.create_summary_table(conn)
+    coin_summary.update_coin_summary(conn, 'bitcoin')
+    conn.close()
+    
+    summary = DataProcessor(db_path=db_path).get_summary()
+    
+    assert sorted(summary.index) == sorted(PRICES)
+    for coin_id in PRICES:
+        assert_matches_prices(summary, coin_id)
+
+def test_get_summary_unknown_coin(db_path):
+    with pytest.raises(ValueError):
+        DataProcessor(db_path=db_path).get_summary(['bitcoin', 'dogecoin'])
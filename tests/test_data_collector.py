@@ -0,0 +1,125 @@
+import sqlite3
+import pytest
+import data_collector
+from data_collector import CoinGeckoCollector
+
+DAY_MS = 86_400_000
+
+def market_chart(samples):
+    """Build a market chart response from (timestamp_ms, price) samples"""
+    return {
+        'prices': [[ts, price] for ts, price in samples],
+        'market_caps': [[ts, price * 10] for ts, price in samples],
+        'total_volumes': [[ts, price * 2] for ts, price in samples]
+    }
+
+def test_transform_converts_timestamps_to_utc_days(collector):
+    # 2025-01-01 00:00 UTC, 2025-01-01 23:59:59.999 UTC and 2025-01-02 00:00 UTC
+    data = market_chart([(20089 * DAY_MS, 1.0), (20090 * DAY_MS - 1, 2.0), (20090 * DAY_MS, 3.0)])
+    
+    df = collector.transform_historical_data(data)
+    
+    assert list(df.columns) == ['date', 'price', 'market_cap', 'volume']
+    assert df['date'].tolist() == [20089, 20089, 20090]
+    assert df['market_cap'].tolist() == [10.0, 20.0, 30.0]
+    assert df['volume'].tolist() == [2.0, 4.0, 6.0]
+
+def test_transform_keeps_api_order_within_a_day(collector):
+    samples = [
+        (20090 * DAY_MS + 1000, 5.0),
+        (20089 * DAY_MS + 3000, 1.0),
+        (20090 * DAY_MS + 2000, 6.0),
+        (20089 * DAY_MS + 1000, 2.0),
+        (20089 * DAY_MS + 2000, 3.0)
+    ]
+    
+    df = collector.transform_historical_data(market_chart(samples))
+    
+    assert df['date'].tolist() == [20089, 20089, 20089, 20090, 20090]
+    assert df['price'].tolist() == [1.0, 2.0, 3.0, 5.0, 6.0]
+
+def test_last_sample_of_a_day_is_stored(collector):
+    samples = [
+        (20089 * DAY_MS, 1.0),
+        (20089 * DAY_MS + 1000, 2.0),
+        (20090 * DAY_MS, 3.0),
+        (20090 * DAY_MS + 1000, 4.0)
+    ]
+    
+    collector.store_coin_data(collector.transform_historical_data(market_chart(samples)), 'bitcoin')
+    
+    rows = collector.conn.execute(
+        "SELECT date, price, market_cap, volume FROM crypto_prices WHERE coin_id = 'bitcoin' ORDER BY date"
+    ).fetchall()
+    assert rows == [(20089, 2.0, 20.0, 4.0), (20090, 4.0, 40.0, 8.0)]
+    
+    summary = collector.conn.execute(
+        "SELECT first_price, last_price FROM coin_summary WHERE coin_id = 'bitcoin'"
+    ).fetchone()
+    assert summary == (2.0, 4.0)
+
+def test_create_database_backfills_coin_summary(tmp_path, monkeypatch):
+    path = str(tmp_path / "crypto.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE crypto_prices (
+            date INTEGER NOT NULL,
+            coin_id TEXT NOT NULL,
+            price REAL NOT NULL,
+            market_cap REAL NOT NULL,
+            volume REAL NOT NULL,
+            PRIMARY KEY (date, coin_id)
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO crypto_prices VALUES (?, ?, ?, ?, ?)",
+        [(20089, 'bitcoin', 100.0, 0.0, 0.0), (20090, 'bitcoin', 110.0, 0.0, 0.0)]
+    )
+    conn.commit()
+    conn.close()
+    
+    monkeypatch.setenv('COINGECKO_API_KEY', 'test-key')
+    monkeypatch.setattr(data_collector, 'DB_PATH', path)
+    collector = CoinGeckoCollector()
+    try:
+        summary = collector.conn.execute(
+            "SELECT coin_id, first_price, last_price FROM coin_summary"
+        ).fetchall()
+    finally:
+        collector.close()
+    
+    assert summary == [('bitcoin', 100.0, 110.0)]
+
+def test_create_database_rejects_text_dates(tmp_path, monkeypatch):
+    path = str(tmp_path / "crypto.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE crypto_prices (
+            date TEXT NOT NULL,
+            coin_id TEXT NOT NULL,
+            price REAL NOT NULL,
+            market_cap REAL NOT NULL,
+            volume REAL NOT NULL,
+            PRIMARY KEY (date, coin_id)
+        )
+    """)
+    conn.execute("INSERT INTO crypto_prices VALUES ('2025-01-01', 'bitcoin', 100.0, 0.0, 0.0)")
+    conn.commit()
+    conn.close()
+    
+    monkeypatch.setenv('COINGECKO_API_KEY', 'test-key')
+    monkeypatch.setattr(data_collector, 'DB_PATH', path)
+    with pytest.raises(ValueError, match="migrate_dates"):
+        CoinGeckoCollector()
+
+def test_failed_summary_refresh_rolls_back_prices(collector, monkeypatch):
+    def fail(coin_id):
+        raise sqlite3.OperationalError("summary refresh failed")
+    monkeypatch.setattr(collector, 'update_coin_summary', fail)
+    
+    data = collector.transform_historical_data(market_chart([(20089 * DAY_MS, 1.0)]))
+    with pytest.raises(sqlite3.OperationalError):
+        collector.store_coin_data(data, 'bitcoin')
+    
+    assert collector.conn.execute("SELECT COUNT(*) FROM crypto_prices").fetchone()[0] == 0
+    assert not collector.conn.in_transaction
@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+import pytest
+import coin_summary
+from data_processor import DataProcessor
+
+# Mixed-case, non-ASCII and punctuated ids, whose order in SQLite's BINARY
+# collation must match the order of the pandas categories
+COIN_IDS = ['bitcoin', 'Bitcoin', 'éther', 'zcash', 'Ethereum', '_wrapped', 'ça-coin', '1inch', 'ether']
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "crypto.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE crypto_prices (
+            date INTEGER NOT NULL,
+            coin_id TEXT NOT NULL,
+            price REAL NOT NULL,
+            market_cap REAL NOT NULL,
+            volume REAL NOT NULL,
+            PRIMARY KEY (date, coin_id)
+        )
+    """)
+    rows = [
+        (20089 + day, coin_id, i * 100.0 + day, 0.0, 0.0)
+        for day in reversed(range(6))
+        for i, coin_id in enumerate(COIN_IDS)
+    ]
+    conn.executemany("INSERT INTO crypto_prices VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return path
+
+@pytest.mark.parametrize('coin_id', COIN_IDS)
+def test_get_price_data_slices_the_coin(db_path, coin_id):
+    df = DataProcessor(db_path=db_path).get_price_data(coin_id)
+    
+    i = COIN_IDS.index(coin_id)
+    assert (df['coin_id'] == coin_id).all()
+    assert df['date'].tolist() == list(pd.to_datetime(np.arange(20089, 20095), unit='D'))
+    assert df['price'].tolist() == [i * 100.0 + day for day in range(6)]
+
+def test_category_order_matches_sql_order(db_path):
+    conn = sqlite3.connect(db_path)
+    sql_order = [row[0] for row in conn.execute("SELECT DISTINCT coin_id FROM crypto_prices ORDER BY coin_id")]
+    conn.close()
+    
+    all_data = DataProcessor(db_path=db_path).get_all_coins_data()
+    
+    assert all_data['coin_id'].cat.categories.tolist() == sql_order
+    assert all_data['coin_id'].cat.codes.is_monotonic_increasing
+
+def test_get_price_data_unknown_coin(db_path):
+    with pytest.raises(ValueError, match="No data found for coin ID: dogecoin"):
+        DataProcessor(db_path=db_path).get_price_data('dogecoin')
+
+def test_all_coins_data_is_cached(db_path):
+    processor = DataProcessor(db_path=db_path)
+    
+    assert processor.get_all_coins_data() is processor.get_all_coins_data()
+
+def test_all_coins_data_reloads_after_write(db_path):
+    processor = DataProcessor(db_path=db_path)
+    before = processor.get_all_coins_data()
+    
+    # Let the write land on a later file timestamp
+    time.sleep(0.05)
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO crypto_prices VALUES (20095, 'bitcoin', 1.0, 0.0, 0.0)")
+    conn.commit()
+    conn.close()
+    
+    after = processor.get_all_coins_data()
+    assert after is not before
+    assert len(after) == len(before) + 1
+
+def test_all_coins_data_reloads_after_wal_write(collector):
+    processor = DataProcessor(db_path=collector.DB_PATH)
+    collector.store_coin_data(pd.DataFrame({
+        'date': [20089], 'price': [1.0], 'market_cap': [0.0], 'volume': [0.0]
+    }), 'bitcoin')
+    before = processor.get_all_coins_data()
+    db_mtime = os.path.getmtime(collector.DB_PATH)
+    
+    # The collector's open WAL connection leaves the main file untouched
+    time.sleep(0.05)
+    collector.store_coin_data(pd.DataFrame({
+        'date': [20090], 'price': [2.0], 'market_cap': [0.0], 'volume': [0.0]
+    }), 'bitcoin')
+    assert os.path.getmtime(collector.DB_PATH) == db_mtime
+    
+    after = processor.get_all_coins_data()
+    assert after['price'].tolist() == [1.0, 2.0]
+
+SUMMARY_PRICES = {
+    'bitcoin': [100.0, 110.0, 90.0, 120.0],
+    'ethereum': [12.0, 11.5, 11.0],
+    'solana': [5.0]
+}
+
+@pytest.fixture
+def summary_db_path(tmp_path):
+    path = str(tmp_path / "summary.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE crypto_prices (
+            date INTEGER NOT NULL,
+            coin_id TEXT NOT NULL,
+            price REAL NOT NULL,
+            market_cap REAL NOT NULL,
+            volume REAL NOT NULL,
+            PRIMARY KEY (date, coin_id)
+        )
+    """)
+    rows = [
+        (20089 + day, coin_id, price, 0.0, 0.0)
+        for coin_id, prices in SUMMARY_PRICES.items()
+        for day, price in enumerate(prices)
+    ]
+    conn.executemany("INSERT INTO crypto_prices VALUES (?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return path
+
+def baseline_strings(coin_id, stats):
+    """Format the dashboard text the way app.py did before it was precomputed"""
+    if stats['price_change_pct'] > 0:
+        trend_status = 'positive'
+        trend = f"{coin_id.capitalize()} showed a positive trend with a {stats['price_change_pct']:.2f}% increase in price."
+    else:
+        trend_status = 'negative'
+        trend = f"{coin_id.capitalize()} showed a negative trend with a {stats['price_change_pct']:.2f}% decrease in price."
+    volatility_level = 'high' if stats['std_price'] > stats['mean_price'] * 0.1 else 'moderate'
+    return {
+        'mean_price': f"${stats['mean_price']:,.2f}",
+        'std_price': f"${stats['std_price']:,.2f}",
+        'min_price': f"${stats['min_price']:,.2f}",
+        'max_price': f"${stats['max_price']:,.2f}",
+        'price_change_pct': f"{stats['price_change_pct']:.2f}%",
+        'trend_status': trend_status,
+        'trend': trend,
+        'volatility': f"The price volatility (standard deviation) was ${stats['std_price']:,.2f}, indicating {volatility_level} market volatility."
+    }
+
+@pytest.mark.parametrize('precomputed', [False, True])
+def test_format_display_strings_matches_baseline(summary_db_path, precomputed):
+    if precomputed:
+        conn = sqlite3.connect(summary_db_path)
+        coin_summary.create_summary_table(conn)
+        coin_summary.backfill_coin_summary(conn)
+        conn.commit()
+        conn.close()
+    
+    processor = DataProcessor(db_path=summary_db_path)
+    coin_ids = list(SUMMARY_PRICES)
+    strings = processor.format_display_strings(processor.get_summary(coin_ids))
+    
+    assert list(strings) == coin_ids
+    for coin_id in coin_ids:
+        _, stats = processor.get_price_analysis(coin_id)
+        assert strings[coin_id] == baseline_strings(coin_id, stats)
+
+def test_format_display_strings_cases(summary_db_path):
+    processor = DataProcessor(db_path=summary_db_path)
+    strings = processor.format_display_strings(processor.get_summary(list(SUMMARY_PRICES)))
+    
+    assert strings['bitcoin']['trend'] == "Bitcoin showed a positive trend with a 20.00% increase in price."
+    assert strings['bitcoin']['volatility'].endswith("indicating high market volatility.")
+    assert strings['ethereum']['trend'] == "Ethereum showed a negative trend with a -8.33% decrease in price."
+    assert strings['ethereum']['volatility'] == (
+        "The price volatility (standard deviation) was $0.50, indicating moderate market volatility."
+    )
+    # A single price has no standard deviation
+    assert strings['solana']['std_price'] == '$nan'
+    assert strings['solana']['trend_status'] == 'negative'
+    assert strings['solana']['volatility'] == (
+        "The price volatility (standard deviation) was $nan, indicating moderate market volatility."
+    )
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from _downsample import lttb_indices, downsample
+
+def test_lttb_returns_all_indices_when_under_limit():
+    x = np.arange(10, dtype=np.float64)
+    assert lttb_indices(x, x, 20).tolist() == list(range(10))
+
+def test_lttb_keeps_endpoints_and_is_increasing():
+    n = 5000
+    x = np.arange(n, dtype=np.float64)
+    y = np.sin(x / 50)
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert np.all(np.diff(idx) > 0)
+
+def test_lttb_buckets_cover_every_point():
+    # A spike at any position must be selected, including n - 2
+    for n in (2003, 2004, 2500, 10_001):
+        for spike in (1, n // 2, n - 2):
+            x = np.arange(n, dtype=np.float64)
+            y = np.zeros(n)
+            y[spike] = 1000.0
+            assert spike in lttb_indices(x, y, 2000), (n, spike)
+
+def test_downsample_frame():
+    df = pd.DataFrame({
+        'date': pd.date_range('2025-01-01', periods=3000, freq='h'),
+        'price': np.random.default_rng(0).random(3000)
+    })
+    result = downsample(df, 'price', n_out=500)
+    assert len(result) == 500
+    assert result['date'].is_monotonic_increasing
+    assert len(downsample(df.head(100), 'price', n_out=500)) == 100
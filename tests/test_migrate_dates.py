@@ -0,0 +1,86 @@
+import sqlite3
+import pytest
+import coin_summary
+from migrate_dates import migrate_dates
+from data_processor import DataProcessor
+
+@pytest.fixture
+def text_db_path(tmp_path):
+    path = str(tmp_path / "crypto.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE crypto_prices (
+            date TEXT NOT NULL,
+            coin_id TEXT NOT NULL,
+            price REAL NOT NULL,
+            market_cap REAL NOT NULL,
+            volume REAL NOT NULL,
+            PRIMARY KEY (date, coin_id)
+        )
+    """)
+    conn.executemany("INSERT INTO crypto_prices VALUES (?, ?, ?, ?, ?)", [
+        ('2025-01-01', 'bitcoin', 100.0, 1.0, 2.0),
+        ('2025-01-02', 'bitcoin', 150.0, 1.0, 2.0),
+        ('2025-03-31', 'bitcoin', 200.0, 1.0, 2.0)
+    ])
+    conn.commit()
+    conn.close()
+    return path
+
+def test_migrate_converts_text_dates(text_db_path):
+    migrate_dates(text_db_path)
+    
+    conn = sqlite3.connect(text_db_path)
+    columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(crypto_prices)")}
+    dates = [row[0] for row in conn.execute("SELECT date FROM crypto_prices ORDER BY date")]
+    conn.close()
+    
+    assert columns['date'] == 'INTEGER'
+    # 2025-01-01 is day 20089 since the epoch
+    assert dates == [20089, 20090, 20178]
+
+def test_migrate_backfills_summary(text_db_path):
+    migrate_dates(text_db_path)
+    
+    summary = DataProcessor(db_path=text_db_path).get_summary(['bitcoin'])
+    assert summary.loc['bitcoin', 'first_price'] == 100.0
+    assert summary.loc['bitcoin', 'last_price'] == 200.0
+    assert summary.loc['bitcoin', 'change_pct'] == 100.0
+
+def test_migrate_is_idempotent(text_db_path):
+    migrate_dates(text_db_path)
+    migrate_dates(text_db_path)
+    
+    df, stats = DataProcessor(db_path=text_db_path).get_price_analysis('bitcoin')
+    assert df['date'].dt.strftime('%Y-%m-%d').tolist() == ['2025-01-01', '2025-01-02', '2025-03-31']
+    assert stats['max_price'] == 200.0
+
+def test_migrate_rejects_dates_not_in_text_format(text_db_path):
+    conn = sqlite3.connect(text_db_path)
+    conn.execute("INSERT INTO crypto_prices VALUES ('20091', 'bitcoin', 300.0, 1.0, 2.0)")
+    conn.commit()
+    conn.close()
+    
+    with pytest.raises(ValueError, match="YYYY-MM-DD"):
+        migrate_dates(text_db_path)
+    
+    conn = sqlite3.connect(text_db_path)
+    columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(crypto_prices)")}
+    count = conn.execute("SELECT COUNT(*) FROM crypto_prices").fetchone()[0]
+    conn.close()
+    assert columns['date'] == 'TEXT'
+    assert count == 4
+
+def test_migrate_recomputes_summaries_of_text_dates(text_db_path):
+    conn = sqlite3.connect(text_db_path)
+    coin_summary.create_summary_table(conn)
+    coin_summary.update_coin_summary(conn, 'bitcoin')
+    conn.execute("UPDATE coin_summary SET first_price = 5.0, change_pct = -60.0")
+    conn.commit()
+    conn.close()
+    
+    migrate_dates(text_db_path)
+    
+    summary = DataProcessor(db_path=text_db_path).get_summary(['bitcoin'])
+    assert summary.loc['bitcoin', 'first_price'] == 100.0
+    assert summary.loc['bitcoin', 'change_pct'] == 100.0